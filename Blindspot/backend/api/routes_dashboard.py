@@ -1,6 +1,6 @@
 from pathlib import Path
-from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
 
 from ..core.services.log_service import log_service
@@ -12,15 +12,27 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 TEMPLATES_DIR = BASE_DIR / "frontend" / "templates"
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
+# The dashboard has no server-side state, so it is rendered once at import time.
+DASHBOARD_HTML = templates.get_template("dashboard.html").render({"request": None}).encode()
+
 
 @router.get("/", response_class=HTMLResponse)
-async def read_dashboard(request: Request):
+async def read_dashboard():
     """Serves the main HTML page for the application."""
-    return templates.TemplateResponse("dashboard.html", {"request": request})
+    return HTMLResponse(content=DASHBOARD_HTML)
 
 
 @router.get("/api/events")
-async def get_events_data():
-    """Provides the latest scan events as JSON for the frontend to fetch."""
+async def get_events_data(request: Request):
+    """
+    Provides the latest scan events as JSON for the frontend to fetch.
+    Polls with a matching If-None-Match header get an empty 304 response
+    while no new events have been logged.
+    """
+    etag = f'W/"{log_service.get_version()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
     events = log_service.get_events()
-    return JSONResponse(content=events)
\ No newline at end of file
+    return ORJSONResponse(content=events, headers=headers)
\ No newline at end of file
@@ -22,6 +22,6 @@ async def scan_text_endpoint(
     Returns:
         A dictionary containing the detailed security analysis of the prompt.
     """
-    result_data = scanner_service.scan_text(input_text, session_id)
+    result_data = await scanner_service.scan_text(input_text, session_id)
     log_service.add_event("text_scan", result_data)
     return result_data
\ No newline at end of file
@@ -1,14 +1,24 @@
+import os
+import shutil
+import tempfile
+import urllib.request
 from typing import Dict, Any
 
-from transformers import pipeline
+import fasttext
 
 from .base_detector import BaseDetector
+from .. import settings
+
+# Official download location of the fastText language identification model.
+LID_MODEL_URL = "https://dl.fbaipublicfiles.com/fasttext/supervised-models/lid.176.bin"
+# Seconds to wait on the download connection before startup gives up.
+DOWNLOAD_TIMEOUT = 30
 
 
 class LanguageDetector(BaseDetector):
     """
-    Identifies the language of a text snippet using a pre-trained
-    Hugging Face model.
+    Identifies the language of a text snippet using fastText's pre-trained
+    lid.176 language identification model.
     """
 
     @property
@@ -17,11 +27,30 @@ class LanguageDetector(BaseDetector):
         return "language_detector"
 
     def __init__(self):
-        """Initializes the text-classification pipeline from Hugging Face."""
-        self.pipe = pipeline(
-            "text-classification",
-            model="papluca/xlm-roberta-base-language-detection"
-        )
+        """Loads the fastText model, downloading it on first use if needed."""
+        model_path = settings.FASTTEXT_LID_MODEL
+        if not model_path.exists():
+            self._download_model(model_path)
+
+        self._ft = fasttext.load_model(str(model_path))
+
+    @staticmethod
+    def _download_model(model_path):
+        """
+        Downloads the model to a temporary file next to its final path and
+        moves it into place once complete, so an interrupted download never
+        leaves a truncated model behind.
+        """
+        model_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=model_path.parent, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                with urllib.request.urlopen(LID_MODEL_URL, timeout=DOWNLOAD_TIMEOUT) as response:
+                    shutil.copyfileobj(response, f)
+            os.replace(tmp_path, model_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
     def detect(self, text: str) -> Dict[str, Any]:
         """
@@ -37,13 +66,14 @@ class LanguageDetector(BaseDetector):
             return {"language": "en"}
 
         try:
-            predictions = self.pipe(text, top_k=1, truncation=True)
-            if predictions:
-                lang_code = predictions[0]['label']
-                return {"language": lang_code}
+            # fastText predicts on single lines, so newlines must be removed. The
+            # list form of predict() also avoids its NumPy 2 incompatibility.
+            labels, _ = self._ft.predict([text.replace("\n", " ")], k=1)
+            if labels and labels[0]:
+                return {"language": labels[0][0].removeprefix("__label__")}
         except Exception as e:
             # In case of an error during prediction, log it and return 'unknown'.
-            print(f"Language detection pipeline failed: {e}")
+            print(f"Language detection failed: {e}")
             return {"language": "unknown"}
 
-        return {"language": "unknown"}
\ No newline at end of file
+        return {"language": "unknown"}
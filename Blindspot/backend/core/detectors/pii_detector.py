@@ -1,8 +1,26 @@
-import re
+import threading
 from typing import Dict, Any
 
+try:
+    import re2 as re  # Linear-time RE2 engine, immune to catastrophic backtracking
+except ImportError:
+    import re
+
+try:
+    import hyperscan
+except ImportError:  # hyperscan is optional and not available on every platform
+    hyperscan = None
+
 from .base_detector import BaseDetector
 
+# The PII types to detect, in the order they are reported. Hyperscan and RE2
+# match \d against ASCII digits only, while the stdlib re fallback also
+# matches other Unicode digits (e.g. Arabic-Indic numerals).
+PII_PATTERNS = {
+    "EMAIL": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
+    "PHONE_NUMBER": r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b",
+}
+
 
 class PIIDetector(BaseDetector):
     """
@@ -15,11 +33,57 @@ class PIIDetector(BaseDetector):
         return "pii_detector"
 
     def __init__(self):
-        """Initializes the detector and compiles the regex patterns for efficiency."""
-        self.patterns = {
-            "EMAIL": re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"),
-            "PHONE_NUMBER": re.compile(r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b"),
-        }
+        """
+        Initializes the detector and compiles all PII patterns into a single
+        matcher, so the text is scanned in one pass. Hyperscan is used when
+        installed; otherwise the patterns are fused into one regex alternation.
+        """
+        self._pii_types = list(PII_PATTERNS)
+
+        if hyperscan is not None:
+            self._database = hyperscan.Database()
+            self._database.compile(
+                expressions=[pattern.encode() for pattern in PII_PATTERNS.values()],
+                ids=list(range(len(self._pii_types))),
+                elements=len(self._pii_types),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(self._pii_types),
+            )
+            # Hyperscan scratch space cannot be shared by concurrent scans.
+            self._scratch = threading.local()
+        else:
+            self._combined = re.compile(
+                "|".join(f"(?P<{pii_type}>{pattern})" for pii_type, pattern in PII_PATTERNS.items())
+            )
+            self._patterns = {pii_type: re.compile(pattern) for pii_type, pattern in PII_PATTERNS.items()}
+
+    def _find_pii_types(self, text: str) -> set:
+        """Returns the set of PII types that occur anywhere in the text."""
+        found = set()
+
+        if hyperscan is not None:
+            if not hasattr(self._scratch, "space"):
+                self._scratch.space = hyperscan.Scratch(self._database)
+
+            def on_match(pattern_id, start, end, flags, context):
+                found.add(self._pii_types[pattern_id])
+
+            self._database.scan(text.encode(), match_event_handler=on_match, scratch=self._scratch.space)
+            return found
+
+        for match in self._combined.finditer(text):
+            found.add(match.lastgroup)
+            if len(found) == len(self._pii_types):
+                return found
+
+        # A match consumes its span, hiding any other PII type overlapping it
+        # (e.g. the phone number in '5551234567@gmail.com'). Once something has
+        # matched, the missing types are searched for on their own.
+        if found:
+            found.update(
+                pii_type for pii_type, pattern in self._patterns.items()
+                if pii_type not in found and pattern.search(text)
+            )
+        return found
 
     def detect(self, text: str) -> Dict[str, Any]:
         """
@@ -32,9 +96,8 @@ class PIIDetector(BaseDetector):
             A dictionary containing a "PII Detected" finding if PII is found,
             otherwise an empty dictionary.
         """
-        findings = [
-            pii_type for pii_type, pattern in self.patterns.items() if pattern.search(text)
-        ]
+        found = self._find_pii_types(text)
+        findings = [pii_type for pii_type in self._pii_types if pii_type in found]
 
         if findings:
             return {
@@ -42,5 +105,5 @@ class PIIDetector(BaseDetector):
                 "score": 1.0,  # PII is always considered a high-severity risk.
                 "details": f"Detected PII types: {', '.join(findings)}",
             }
-            
-        return {}
\ No newline at end of file
+
+        return {}
@@ -1,11 +1,28 @@
 import json
+import math
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 import torch
 from sentence_transformers import SentenceTransformer, util
+from sklearn.cluster import KMeans
 
 from .base_detector import BaseDetector
+from .. import settings
+
+# Below this many threat phrases a full similarity scan is cheaper than clustering.
+MIN_PROMPTS_FOR_CLUSTERING = 64
+# Number of nearest clusters whose members are compared against the input.
+TOP_CLUSTERS = 2
+# Fixed k-means seed, so the clusters and the scores they yield are stable across restarts.
+KMEANS_SEED = 0
+# The pre-quantized int8 ONNX graph shipped in the sentence-transformers model repo.
+QUANTIZED_ONNX_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+def max_similarity(embeddings: torch.Tensor, query: torch.Tensor) -> torch.Tensor:
+    """Returns the highest dot product between the query and any embedding row."""
+    return torch.max(embeddings @ query)
 
 
 class SemanticDetector(BaseDetector):
@@ -23,15 +40,91 @@ class SemanticDetector(BaseDetector):
         """
         Initializes the detector, loads the sentence transformer model, and
         pre-computes embeddings for the threat intelligence list for efficiency.
+        The model runs on the GPU in half precision when one is available.
         """
-        self.model = SentenceTransformer(model_name)
+        # The ONNX Runtime models are always served from the CPU.
+        self.device = "cuda" if torch.cuda.is_available() and not settings.ONNX_INT8 else "cpu"
+        self.dtype = torch.float16 if self.device == "cuda" else torch.float32
+
+        # On the GPU, Inductor fuses the similarity GEMV and the max into one kernel.
+        self._max_similarity = max_similarity
+        compile_model = settings.TORCH_COMPILE and hasattr(torch, "compile")
+        if self.device == "cuda" and compile_model:
+            self._max_similarity = torch.compile(max_similarity, dynamic=True)
+
+        eager_model = None
+        if settings.ONNX_INT8:
+            import onnxruntime
+
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = settings.ORT_INTRA_OP_THREADS
+            self.model = SentenceTransformer(
+                model_name,
+                backend="onnx",
+                model_kwargs={
+                    "file_name": QUANTIZED_ONNX_FILE,
+                    "provider": "CPUExecutionProvider",
+                    "session_options": session_options,
+                },
+            )
+        else:
+            self.model = SentenceTransformer(model_name, device=self.device)
+            if compile_model:
+                # Encoding the threat list below doubles as the compile warm-up. Shapes
+                # vary with every batch, so the graph is compiled for dynamic shapes.
+                eager_model = self.model[0].auto_model
+                self.model[0].auto_model = torch.compile(eager_model, dynamic=True)
         self.tokenizer = self.model.tokenizer
 
-        config_path = Path(__file__).resolve().parent.parent.parent.parent / "threat_intelligence.json"
+        config_path = Path(__file__).resolve().parent.parent.parent / "config" / "threat_intelligence.json"
         with open(config_path, 'r', encoding='utf-8') as f:
             risky_prompts = json.load(f).get("risky_prompts", [])
         
-        self.risky_embeddings = self.model.encode(risky_prompts, convert_to_tensor=True)
+        try:
+            self._embed_threats(risky_prompts)
+        except Exception as e:
+            if not compile_model:
+                raise
+            # Inductor needs a working C++/CUDA toolchain, so fall back to eager mode without one.
+            print(f"torch.compile failed, running the semantic detector in eager mode: {e}")
+            if eager_model is not None:
+                self.model[0].auto_model = eager_model
+            self._max_similarity = max_similarity
+            self._embed_threats(risky_prompts)
+
+        self.centroids: torch.Tensor | None = None
+        self.cluster_members: List[torch.Tensor] = []
+        if len(risky_prompts) >= MIN_PROMPTS_FOR_CLUSTERING:
+            self._build_clusters()
+
+    def _embed_threats(self, risky_prompts: List[str]):
+        """Encodes the threat list, also warming up the similarity function."""
+        # Embeddings are L2-normalized, so cosine similarity is a plain dot product.
+        self.risky_embeddings = self.model.encode(
+            risky_prompts, convert_to_tensor=True, normalize_embeddings=True
+        ).to(self.dtype)
+        if len(self.risky_embeddings):
+            self._max_similarity(self.risky_embeddings, self.risky_embeddings[0])
+
+    def _build_clusters(self):
+        """Groups the threat embeddings into roughly sqrt(N) k-means clusters."""
+        n_clusters = round(math.sqrt(len(self.risky_embeddings)))
+        kmeans = KMeans(n_clusters=n_clusters, n_init=4, random_state=KMEANS_SEED)
+        kmeans.fit(self.risky_embeddings.float().cpu().numpy())
+
+        labels = torch.from_numpy(kmeans.labels_).to(self.risky_embeddings.device)
+        centroids = util.normalize_embeddings(torch.from_numpy(kmeans.cluster_centers_))
+        self.centroids = centroids.to(self.risky_embeddings.device, self.dtype)
+        self.cluster_members = [self.risky_embeddings[labels == i] for i in range(n_clusters)]
+
+    def _candidate_embeddings(self, input_embedding: torch.Tensor) -> torch.Tensor:
+        """Returns the threat embeddings worth comparing against the input."""
+        if self.centroids is None:
+            return self.risky_embeddings
+
+        centroid_scores = self.centroids @ input_embedding
+        top_clusters = torch.topk(centroid_scores, k=min(TOP_CLUSTERS, len(self.cluster_members))).indices
+        return torch.cat([self.cluster_members[i] for i in top_clusters.tolist()])
 
     def detect(self, text: str) -> Dict[str, Any]:
         """
@@ -45,15 +138,47 @@ class SemanticDetector(BaseDetector):
             text: The user-provided prompt to analyze.
 
         Returns:
-            A dictionary containing the risk score and token count.
+            A dictionary containing the risk score and token count, plus the
+            prompt embedding under the private "_emb" key for reuse by callers.
         """
-        if not text.strip():
-            return {}
+        return self.detect_batch([text])[0]
 
-        token_count = len(self.tokenizer.encode(text))
-        input_embedding = self.model.encode(text, convert_to_tensor=True)
-        
-        cosine_scores = util.cos_sim(input_embedding, self.risky_embeddings)
-        max_score = float(torch.max(cosine_scores))
+    def detect_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Scores several texts at once, encoding them in a single batched call.
+
+        Args:
+            texts: The user-provided prompts to analyze.
+
+        Returns:
+            One result dictionary per text, in the same order, as described
+            for detect(). Blank texts get an empty dictionary.
+        """
+        results: List[Dict[str, Any]] = [{} for _ in texts]
+        indices = [i for i, text in enumerate(texts) if text.strip()]
+        if not indices:
+            return results
+
+        # Tokenize once without truncation, so the token count covers the whole prompt,
+        # then cut the ids to the encoder's limit for the forward pass
+        tokenizer = self.tokenizer
+        num_special_tokens = tokenizer.num_special_tokens_to_add()
+        max_content_length = self.model.max_seq_length - num_special_tokens
+        token_ids = tokenizer([texts[i].strip() for i in indices], add_special_tokens=False)["input_ids"]
+        token_counts = [len(ids) + num_special_tokens for ids in token_ids]
+
+        input_ids = [tokenizer.build_inputs_with_special_tokens(ids[:max_content_length]) for ids in token_ids]
+        features = tokenizer.pad({"input_ids": input_ids}, return_tensors="pt")
+        if "token_type_ids" in tokenizer.model_input_names:
+            features["token_type_ids"] = torch.zeros_like(features["input_ids"])
+        features = util.batch_to_device(features, self.model.device)
+
+        with torch.inference_mode(), torch.autocast(self.device, dtype=torch.float16, enabled=self.device == "cuda"):
+            input_embeddings = self.model(features)["sentence_embedding"]
+        input_embeddings = util.normalize_embeddings(input_embeddings).to(self.dtype)
+
+        for i, token_count, input_embedding in zip(indices, token_counts, input_embeddings):
+            max_score = self._max_similarity(self._candidate_embeddings(input_embedding), input_embedding).item()
+            results[i] = {"score": round(max_score, 2), "token_count": token_count, "_emb": input_embedding}
 
-        return {"score": round(max_score, 2), "token_count": token_count}
\ No newline at end of file
+        return results
\ No newline at end of file
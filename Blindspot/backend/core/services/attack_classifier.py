@@ -1,10 +1,20 @@
 
-import re
 from typing import Dict, Any, List, Tuple
 
+try:
+    import re2 as re  # Linear-time RE2 engine, immune to catastrophic backtracking
+except ImportError:
+    import re
+
 import torch
+from sentence_transformers import SentenceTransformer
 from transformers import pipeline
 
+from .. import settings
+
+# The Hugging Face model used for zero-shot classification.
+ZSL_MODEL_NAME = "facebook/bart-large-mnli"
+
 # A curated list of high-risk categories for classification.
 RISK_LABELS = [
     "Jailbreak",
@@ -27,92 +37,359 @@ TEMPLATES = {
     "PII Harvesting": "This text attempts to collect personal information from users.",
 }
 
+# The hypotheses in RISK_LABELS order, built once for every model call.
+HYPOTHESES = [TEMPLATES[label] for label in RISK_LABELS]
+
+# An extra anchor used by the embedding mode. It competes with the risk labels
+# in the softmax, so an ordinary prompt does not have to pick an attack label.
+BENIGN_TEMPLATE = "This text is an ordinary, harmless question or request."
+
 # High-signal regex patterns for fast, priority overrides.
-REGEX_PATTERNS: List[Tuple[str, re.Pattern]] = [
-    ("Prompt Injection", re.compile(r"\b(ignore|override|disregard).*\b(instructions|rules)\b", re.IGNORECASE)),
-    ("Jailbreak", re.compile(r"\b(roleplay as|act as|DAN\b|developer mode|no restrictions)\b", re.IGNORECASE)),
-    ("Data Exfiltration", re.compile(r"\b(secret|token|api[-\s]?key|\.env|credentials?|password)\b", re.IGNORECASE)),
+REGEX_PATTERNS: List[Tuple[str, str]] = [
+    ("Prompt Injection", r"\b(?:ignore|override|disregard).{0,64}?\b(?:instructions|rules)\b"),
+    ("Jailbreak", r"\b(?:roleplay as|act as|DAN\b|developer mode|no restrictions)\b"),
+    ("Data Exfiltration", r"\b(?:secret|token|api[-\s]?key|\.env|credentials?|password)\b"),
 ]
 
+# Maps each named group of the fused pattern back to its attack label.
+LABEL_MAP = {label.replace(" ", ""): label for label, _ in REGEX_PATTERNS}
+
+# All regex patterns fused into one alternation, so a single search tells
+# whether the text contains any attack cue at all.
+FUSED_REGEX = re.compile(
+    "(?i)" + "|".join(f"(?P<{label.replace(' ', '')}>{pattern})" for label, pattern in REGEX_PATTERNS)
+)
+
+# The individual patterns, in priority order, used to resolve the label once
+# the fused search has found a cue.
+LABEL_REGEXES = [(label, re.compile("(?i)" + pattern)) for label, pattern in REGEX_PATTERNS]
+
+# Prompts shorter than this, made of plain text and only of harmless
+# conversational words, are classified as benign without running the AI model.
+SHORT_PROMPT_LENGTH = 20
+
+# Plain ASCII words and punctuation. Digits, symbols and non-ASCII characters
+# are common in obfuscated attacks (e.g. 'byp@ss'), so they disqualify a prompt.
+PLAIN_TEXT_REGEX = re.compile(r"[A-Za-z\s.,!?'-]*")
+
+# Greetings and acknowledgements. A short prompt skips the AI path only if it
+# is made entirely of these words; any other word, however short the prompt,
+# may carry one of the risk labels and is left to the model.
+BENIGN_SHORT_PROMPT_WORDS = frozenset({
+    "hi", "hello", "hey", "there", "good", "morning", "afternoon", "evening", "night",
+    "bye", "goodbye", "thanks", "thank", "you", "so", "much", "very", "please",
+    "ok", "okay", "yes", "no", "yep", "nope", "sure", "great", "cool", "nice", "got", "it",
+})
+
 # Confidence thresholds for classification logic.
 PRIMARY_THRESHOLD = 0.60  # Minimum score for a ZSL classification to be considered.
 BENIGN_FALLBACK_THRESHOLD = 0.50  # If the top score is below this, it's likely benign.
+# Embedding mode only. These values are uncalibrated starting points and should be
+# tuned against the accurate mode before relying on the fast mode.
+EMBEDDING_TEMPERATURE = 0.05  # Sharpens label similarities into a softmax distribution.
+MIN_LABEL_SIMILARITY = 0.35  # Below this raw cosine similarity to every risk label, a prompt is benign.
 
 
 class AttackClassifier:
     """
     A hybrid classifier that uses regex for high-confidence patterns and a
     zero-shot AI model for nuanced semantic analysis.
+
+    By default the AI path runs the BART-MNLI zero-shot model. Setting the
+    classifier mode to 'fast' instead compares the prompt's sentence embedding
+    with pre-computed embeddings of the label hypotheses.
     """
 
-    def __init__(self):
-        """Initializes the zero-shot classification pipeline from Hugging Face."""
-        self._zsl_pipeline = pipeline(
+    def __init__(self, encoder: SentenceTransformer | None = None):
+        """
+        Initializes the classifier's AI path.
+
+        Args:
+            encoder: The sentence transformer used in 'fast' mode, shared with
+                the semantic detector. Unused in the default 'accurate' mode.
+        """
+        self._zsl_pipeline = None
+        self._encoder = encoder
+        eager_model = None
+
+        if settings.CLASSIFIER_MODE == "fast":
+            if encoder is None:
+                raise ValueError("The fast attack classifier requires a sentence encoder.")
+            # The benign anchor is stored last, after the risk label hypotheses.
+            self._label_embeddings = encoder.encode(
+                HYPOTHESES + [BENIGN_TEMPLATE],
+                convert_to_tensor=True,
+                normalize_embeddings=True,
+            )
+        elif settings.ONNX_INT8:
+            self._zsl_pipeline = self._load_quantized_zsl_pipeline()
+        else:
+            self._zsl_pipeline = pipeline(
+                "zero-shot-classification",
+                model=ZSL_MODEL_NAME,
+                device=0 if torch.cuda.is_available() else -1,
+            )
+            if settings.TORCH_COMPILE and hasattr(torch, "compile"):
+                eager_model = self._zsl_pipeline.model
+                self._zsl_pipeline.model = torch.compile(eager_model, dynamic=True)
+
+        if self._zsl_pipeline is not None:
+            # The hypotheses never change, so they are tokenized only once.
+            tokenizer = self._zsl_pipeline.tokenizer
+            self._hypothesis_ids = tokenizer(HYPOTHESES, add_special_tokens=False)["input_ids"]
+            self._special_ids = frozenset(tokenizer.all_special_ids)
+            # The pipeline's entailment_id property searches the label map on every access.
+            self._entailment_id = self._zsl_pipeline.entailment_id
+            self._max_premise_length = (
+                tokenizer.model_max_length
+                - max(len(ids) for ids in self._hypothesis_ids)
+                - tokenizer.num_special_tokens_to_add(pair=True)
+            )
+            # Run the model once now so any compilation does not delay the first request.
+            try:
+                self._get_zsl_predictions(["Warm up the model."])
+            except Exception as e:
+                if eager_model is None:
+                    raise
+                print(f"torch.compile failed, running the attack classifier in eager mode: {e}")
+                self._zsl_pipeline.model = eager_model
+                self._get_zsl_predictions(["Warm up the model."])
+
+    @staticmethod
+    def _load_quantized_zsl_pipeline():
+        """
+        Builds the zero-shot pipeline on an int8-quantized ONNX export of the
+        model. The export and dynamic quantization run once and are cached
+        on disk for later startups.
+        """
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        model_dir = settings.MODEL_CACHE_DIR / "bart-large-mnli-int8"
+        if not (model_dir / "model_quantized.onnx").exists():
+            onnx_model = ORTModelForSequenceClassification.from_pretrained(ZSL_MODEL_NAME, export=True)
+            quantizer = ORTQuantizer.from_pretrained(onnx_model)
+            quantizer.quantize(
+                save_dir=model_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False),
+            )
+            AutoTokenizer.from_pretrained(ZSL_MODEL_NAME).save_pretrained(model_dir)
+
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = settings.ORT_INTRA_OP_THREADS
+        quantized_model = ORTModelForSequenceClassification.from_pretrained(
+            model_dir,
+            file_name="model_quantized.onnx",
+            provider="CPUExecutionProvider",
+            session_options=session_options,
+        )
+        return pipeline(
             "zero-shot-classification",
-            model="facebook/bart-large-mnli",
-            device=0 if torch.cuda.is_available() else -1,
+            model=quantized_model,
+            tokenizer=AutoTokenizer.from_pretrained(model_dir),
         )
 
-    def _get_regex_match(self, text: str) -> str | None:
-        """Performs a fast check for high-confidence attack patterns using regex."""
-        for label, pattern in REGEX_PATTERNS:
-            if pattern.search(text):
+    @staticmethod
+    def _is_trivially_benign(text: str) -> bool:
+        """Cheaply checks whether a prompt is a short greeting or acknowledgement."""
+        if len(text) >= SHORT_PROMPT_LENGTH or not PLAIN_TEXT_REGEX.fullmatch(text):
+            return False
+        tokens = set(re.findall(r"[a-z]+", text.lower()))
+        return bool(tokens) and tokens <= BENIGN_SHORT_PROMPT_WORDS
+
+    @staticmethod
+    def _get_regex_match(text: str) -> str | None:
+        """
+        Performs a fast check for high-confidence attack patterns using regex.
+        When several labels' cues occur, the earliest label in REGEX_PATTERNS
+        wins, regardless of where its cue appears in the text.
+        """
+        match = FUSED_REGEX.search(text)
+        if not match:
+            return None
+
+        # The leftmost cue's label is a match, so only higher-priority labels need checking
+        first_label = LABEL_MAP[match.lastgroup]
+        for label, regex in LABEL_REGEXES:
+            if label == first_label or regex.search(text):
                 return label
-        return None
-
-    def _get_zsl_prediction(self, text: str) -> Dict[str, float]:
-        """Uses the Zero-Shot model to get a probability distribution over risk labels."""
-        hypotheses = [TEMPLATES[label] for label in RISK_LABELS]
-        output = self._zsl_pipeline(
-            sequences=text,
-            candidate_labels=hypotheses,
-            hypothesis_template="{}",
-        )
-        # Align scores back to our original, simple label names
-        return {label: float(score) for label, score in zip(RISK_LABELS, output["scores"])}
 
-    def classify(self, text: str) -> Dict[str, Any]:
+    @torch.inference_mode()
+    def _get_embedding_predictions(
+        self, texts: List[str], embeddings: List[torch.Tensor | None]
+    ) -> List[Dict[str, float]]:
+        """
+        Scores each text against every label hypothesis by embedding similarity.
+        The benign anchor takes part in the softmax but is left out of the
+        returned scores, and prompts not close enough to any risk label score
+        zero throughout.
+        """
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            encoded = self._encoder.encode([texts[i] for i in missing], convert_to_tensor=True)
+            embeddings = list(embeddings)
+            for i, embedding in zip(missing, encoded):
+                embeddings[i] = embedding
+
+        queries = torch.stack([embedding.to(self._label_embeddings) for embedding in embeddings])
+        queries = torch.nn.functional.normalize(queries, dim=-1)
+
+        similarities = queries @ self._label_embeddings.T
+        probabilities = torch.softmax(similarities / EMBEDDING_TEMPERATURE, dim=-1)[:, :len(RISK_LABELS)]
+        best_similarity = similarities[:, :len(RISK_LABELS)].max(dim=-1, keepdim=True).values
+        probabilities = probabilities * (best_similarity >= MIN_LABEL_SIMILARITY)
+        return [dict(zip(RISK_LABELS, row)) for row in probabilities.tolist()]
+
+    @torch.inference_mode()
+    def _get_zsl_predictions(self, texts: List[str]) -> List[Dict[str, float]]:
+        """
+        Uses the Zero-Shot model to get a probability distribution over risk labels.
+
+        Each premise is tokenized once and paired with the pre-tokenized
+        hypotheses directly, rather than letting the pipeline re-encode the
+        premise for every candidate label.
+        """
+        tokenizer = self._zsl_pipeline.tokenizer
+        premise_ids = tokenizer(
+            texts, add_special_tokens=False, truncation=True, max_length=self._max_premise_length
+        )["input_ids"]
+        # A literal '</s>' in a prompt still tokenizes to the eos id, and BART rejects
+        # a batch whose rows have different eos counts, so such ids are dropped.
+        premise_ids = [[token for token in ids if token not in self._special_ids] for ids in premise_ids]
+        pairs = [
+            tokenizer.build_inputs_with_special_tokens(premise, hypothesis)
+            for premise in premise_ids
+            for hypothesis in self._hypothesis_ids
+        ]
+        inputs = tokenizer.pad({"input_ids": pairs}, return_tensors="pt").to(self._zsl_pipeline.device)
+
+        logits = self._zsl_pipeline.model(**inputs).logits
+
+        # As in the pipeline, softmax the entailment logits across the candidate labels
+        entailment_logits = logits[:, self._entailment_id].reshape(len(texts), len(RISK_LABELS))
+        probabilities = torch.softmax(entailment_logits.float(), dim=-1)
+        return [dict(zip(RISK_LABELS, row)) for row in probabilities.tolist()]
+
+    @staticmethod
+    def _decide(scores: Dict[str, float]) -> Dict[str, Any]:
+        """Turns a probability map into the final classification."""
+        top_label = max(scores, key=scores.get)
+        top_score = scores[top_label]
+
+        if top_score >= PRIMARY_THRESHOLD:
+            primary_classification = top_label
+            confidence = top_score
+        elif top_score >= BENIGN_FALLBACK_THRESHOLD:
+            # The result is ambiguous but leans toward a threat.
+            primary_classification = top_label
+            confidence = top_score
+        else:
+            # The model is not confident in any threat category.
+            primary_classification = "Benign"
+            confidence = 1.0 - top_score
+
+        return {
+            "primary": primary_classification,
+            "confidence": float(confidence),
+            "probabilities": scores,
+        }
+
+    def classify(self, text: str, embedding: torch.Tensor | None = None) -> Dict[str, Any]:
         """
         Classifies the input text, returning a dictionary with the primary
         attack type, confidence, and a full probability map.
+
+        Args:
+            text: The user-provided prompt to analyze.
+            embedding: The prompt's sentence embedding, if already computed,
+                so the fast mode does not need to encode the text again.
+        """
+        return self.classify_batch([text], [embedding])[0]
+
+    def classify_batch(
+        self, texts: List[str], embeddings: List[torch.Tensor | None] | None = None
+    ) -> List[Dict[str, Any]]:
         """
-        if not text or not text.strip():
-            return {"primary": "Benign", "confidence": 1.0, "probabilities": {}}
-
-        # 1. Regex Override Path: Fast and high-confidence for obvious attacks.
-        regex_match = self._get_regex_match(text)
-        if regex_match:
-            return {
-                "primary": regex_match,
-                "confidence": 0.99,  # Assign a near-certain confidence for regex hits
-                "probabilities": {regex_match: 0.99},
-            }
-
-        # 2. AI Path: If no regex matches, use the zero-shot model.
+        Classifies several texts at once. Texts that reach the AI path share a
+        single batched model call.
+
+        Args:
+            texts: The user-provided prompts to analyze.
+            embeddings: The prompts' sentence embeddings where already computed.
+
+        Returns:
+            One classification dictionary per text, in the same order. Its
+            "source" key names the path that decided it: "empty", "regex",
+            "short_circuit", "model" or "error".
+        """
+        if embeddings is None:
+            embeddings = [None] * len(texts)
+
+        results: List[Dict[str, Any] | None] = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                results[i] = {"primary": "Benign", "confidence": 1.0, "probabilities": {}, "source": "empty"}
+                continue
+
+            # 1. Regex Override Path: Fast and high-confidence for obvious attacks.
+            regex_match = self._get_regex_match(text)
+            if regex_match:
+                results[i] = {
+                    "primary": regex_match,
+                    "confidence": 0.99,  # Assign a near-certain confidence for regex hits
+                    "probabilities": {regex_match: 0.99},
+                    "source": "regex",
+                }
+                continue
+
+            # 2. Short-Circuit Path: Skip the model for short greetings and acknowledgements.
+            if self._is_trivially_benign(text):
+                results[i] = {
+                    "primary": "Benign", "confidence": 0.95, "probabilities": {}, "source": "short_circuit"
+                }
+                continue
+
+            pending.append(i)
+
+        if not pending:
+            return results
+
+        # 3. AI Path: If no regex matches, use the zero-shot model.
         try:
-            scores = self._get_zsl_prediction(text)
-            top_label = max(scores, key=scores.get)
-            top_score = scores[top_label]
-
-            # 3. Decision Logic: Determine the final classification.
-            if top_score >= PRIMARY_THRESHOLD:
-                primary_classification = top_label
-                confidence = top_score
-            elif top_score >= BENIGN_FALLBACK_THRESHOLD:
-                # The result is ambiguous but leans toward a threat.
-                primary_classification = top_label
-                confidence = top_score
-            else:
-                # The model is not confident in any threat category.
-                primary_classification = "Benign"
-                confidence = 1.0 - top_score
-
-            return {
-                "primary": primary_classification,
-                "confidence": float(confidence),
-                "probabilities": scores,
-            }
+            all_scores = self._get_predictions(texts, embeddings, pending)
         except Exception as e:
-            # Fallback in case the AI model fails.
-            print(f"Attack classification pipeline failed: {e}")
-            return {"primary": "Classification Error", "confidence": 0.0}
\ No newline at end of file
+            if len(pending) == 1:
+                all_scores = [e]
+            else:
+                # One bad prompt must not decide the result for the rest of the
+                # batch, so each prompt is retried on its own.
+                print(f"Batched attack classification failed, retrying prompts one by one: {e}")
+                all_scores = []
+                for i in pending:
+                    try:
+                        all_scores.extend(self._get_predictions(texts, embeddings, [i]))
+                    except Exception as retry_error:
+                        all_scores.append(retry_error)
+
+        # 4. Decision Logic: Determine the final classification.
+        for i, scores in zip(pending, all_scores):
+            if isinstance(scores, Exception):
+                # Fallback in case the AI model fails.
+                print(f"Attack classification pipeline failed: {scores}")
+                results[i] = {"primary": "Classification Error", "confidence": 0.0, "source": "error"}
+            else:
+                results[i] = {**self._decide(scores), "source": "model"}
+
+        return results
+
+    def _get_predictions(
+        self, texts: List[str], embeddings: List[torch.Tensor | None], indices: List[int]
+    ) -> List[Dict[str, float]]:
+        """Runs the configured AI path over the texts at the given indices."""
+        selected_texts = [texts[i] for i in indices]
+        if self._zsl_pipeline is None:
+            return self._get_embedding_predictions(selected_texts, [embeddings[i] for i in indices])
+        return self._get_zsl_predictions(selected_texts)
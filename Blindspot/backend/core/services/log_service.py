@@ -1,5 +1,7 @@
-from datetime import datetime
-from typing import List, Dict, Any
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, List, Dict, Any
 
 
 class LogService:
@@ -8,29 +10,36 @@ class LogService:
     It holds a maximum of 100 events to prevent memory issues.
     """
     def __init__(self):
-        """Initializes the event list."""
-        self.events: List[Dict[str, Any]] = []
+        """Initializes the event log as a bounded deque."""
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=100)
+        # Incremented on every new event, so clients can cheaply detect changes.
+        # The instance ID keeps versions from a previous server run from matching.
+        self._version = 0
+        self._instance_id = uuid.uuid4().hex[:8]
 
     def add_event(self, event_type: str, data: dict):
         """
-        Creates a new log entry with a timestamp and prepends it to the event list.
-        If the list exceeds 100 entries, the oldest one is removed.
+        Creates a new log entry with a timestamp and prepends it to the event log.
+        Once the log holds 100 entries, the deque drops the oldest one.
         """
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            # Serialized as an RFC 3339 string by the orjson response class
+            "timestamp": datetime.now(timezone.utc),
             "event_type": event_type,
             "data": data
         }
 
         # Maintain a rolling log of the last 100 events
-        if len(self.events) >= 100:
-            self.events.pop()
-        
-        self.events.insert(0, log_entry)
+        self.events.appendleft(log_entry)
+        self._version += 1
+
+    def get_version(self) -> str:
+        """Returns an identifier that changes whenever a new event is logged."""
+        return f"{self._instance_id}-{self._version}"
 
     def get_events(self) -> List[Dict[str, Any]]:
-        """Returns the current list of all stored events."""
-        return self.events
+        """Returns the current list of all stored events, newest first."""
+        return list(self.events)
 
 # A single, shared instance of the service for the entire application to use.
 log_service = LogService()
\ No newline at end of file
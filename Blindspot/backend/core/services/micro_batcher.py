@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any, Callable, List, Tuple
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests into small batches for a batch-processing
+    function, so the models behind it run one batched forward pass instead of
+    many single-item ones. Under low load an item is processed immediately
+    instead of waiting for others to arrive.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 16,
+        max_wait: float = 0.005,
+    ):
+        """
+        Args:
+            process_batch: A blocking function mapping a list of items to a
+                list of results in the same order. It runs in a worker thread.
+            max_batch_size: The largest number of items processed together.
+            max_wait: Seconds to wait for more items once a batch has started filling.
+        """
+        self._process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queues an item for the next batch and waits for its result."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            # Created lazily so that they bind to the running event loop, and
+            # recreated if that loop has changed or the worker has stopped.
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect_batch(self) -> List[Tuple[Any, asyncio.Future]]:
+        """Waits for the first item, then gathers any others arriving shortly after."""
+        batch = [await self._queue.get()]
+        if self._queue.empty():
+            return batch
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        """Processes batches for as long as the event loop runs."""
+        while True:
+            batch = await self._collect_batch()
+            try:
+                results = await asyncio.to_thread(self._process_batch, [item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"Batch of {len(batch)} items returned {len(results)} results.")
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
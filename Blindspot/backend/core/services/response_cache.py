@@ -0,0 +1,69 @@
+import threading
+from typing import Dict, Any, List
+
+import torch
+from sentence_transformers import util
+
+# Prompts at least this similar to a cached prompt reuse its classification.
+SIMILARITY_THRESHOLD = 0.87
+
+
+class SemanticResponseCache:
+    """
+    A fixed-size, in-memory cache of attack classifications keyed by prompt
+    embedding. Lookups return the result of the most similar cached prompt,
+    so repeated or lightly paraphrased prompts skip the expensive AI path.
+    """
+
+    def __init__(self, capacity: int = 4096, embedding_dim: int = 384):
+        """Preallocates the embedding store so it stays contiguous in memory."""
+        self.capacity = capacity
+        self._embeddings = torch.zeros(capacity, embedding_dim)
+        self._results: List[Dict[str, Any] | None] = [None] * capacity
+        self._last_used: List[int] = [0] * capacity
+        self._size = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, embedding: torch.Tensor) -> Dict[str, Any] | None:
+        """
+        Finds the cached result whose prompt is most similar to the given one.
+
+        Args:
+            embedding: The sentence embedding of the incoming prompt.
+
+        Returns:
+            The cached result dictionary, or None if nothing is similar enough.
+        """
+        query = embedding.to(self._embeddings.device, dtype=self._embeddings.dtype)
+        with self._lock:
+            if self._size == 0:
+                return None
+
+            scores = util.cos_sim(query, self._embeddings[:self._size])[0]
+            best_score, best_idx = torch.max(scores, dim=0)
+            if float(best_score) < SIMILARITY_THRESHOLD:
+                return None
+
+            idx = int(best_idx)
+            self._clock += 1
+            self._last_used[idx] = self._clock
+            return self._results[idx]
+
+    def insert(self, embedding: torch.Tensor, result: Dict[str, Any]):
+        """
+        Stores a result, replacing the least recently used row in place once
+        the cache is full.
+        """
+        row = embedding.to(self._embeddings.device, dtype=self._embeddings.dtype)
+        with self._lock:
+            if self._size < self.capacity:
+                idx = self._size
+                self._size += 1
+            else:
+                idx = min(range(self.capacity), key=self._last_used.__getitem__)
+
+            self._embeddings[idx] = row
+            self._results[idx] = result
+            self._clock += 1
+            self._last_used[idx] = self._clock
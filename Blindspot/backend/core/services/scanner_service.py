@@ -1,11 +1,17 @@
+import asyncio
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 from .attack_classifier import AttackClassifier
+from .micro_batcher import MicroBatcher
+from .response_cache import SemanticResponseCache
 from ..detectors.language_detector import LanguageDetector
 from ..detectors.pii_detector import PIIDetector
 from ..detectors.semantic_detector import SemanticDetector
+from .. import settings
 
 
 class ScannerService:
@@ -16,28 +22,68 @@ class ScannerService:
 
     def __init__(self):
         """
-        Initializes the service, loading the classifier and attack library.
-        Heavy AI detectors are lazy-loaded on the first scan request for
-        faster server startup.
+        Initializes the service and loads the attack library. The heavy AI
+        detectors and the classifier are loaded in the background by the
+        application's startup event, or lazily by the first scan request if
+        that comes first.
         """
         self.detectors: List[Any] | None = None
-        self.classifier = AttackClassifier()
+        self.pii_detector: PIIDetector | None = None
+        self.semantic_detector: SemanticDetector | None = None
+        self.classifier: AttackClassifier | None = None
+        self._detectors_lock = threading.Lock()
+        self.response_cache = SemanticResponseCache()
+
+        # Concurrent scans share batched calls into the semantic encoder and the classifier
+        self._semantic_batcher = MicroBatcher(self._detect_semantic_batch)
+        self._classifier_batcher = MicroBatcher(self._classify_batch)
 
         library_path = Path(__file__).resolve().parent.parent.parent / "config" / "attack_library.json"
         with open(library_path, 'r', encoding='utf-8') as f:
             self.attack_library = json.load(f)
 
     def _initialize_detectors(self):
-        """Handles the one-time, slow initialization of heavy AI models."""
-        self.detectors = [
-            PIIDetector(),
-            SemanticDetector(),
-            LanguageDetector(),
-        ]
-
-    def scan_text(self, text: str, session_id: str) -> Dict[str, Any]:
+        """
+        Handles the one-time, slow initialization of heavy AI models. The
+        models are loaded concurrently, and the lock ensures that concurrent
+        callers wait for a single initialization rather than repeating it.
+        """
+        with self._detectors_lock:
+            if self.detectors is not None:
+                return
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                pii_future = executor.submit(PIIDetector)
+                semantic_future = executor.submit(SemanticDetector)
+                language_future = executor.submit(LanguageDetector)
+                # In fast mode the classifier shares the semantic detector's sentence encoder
+                classifier_future = executor.submit(
+                    lambda: AttackClassifier(
+                        encoder=semantic_future.result().model if settings.CLASSIFIER_MODE == "fast" else None
+                    )
+                )
+
+                self.classifier = classifier_future.result()
+                self.pii_detector = pii_future.result()
+                self.semantic_detector = semantic_future.result()
+                self.detectors = [self.pii_detector, self.semantic_detector, language_future.result()]
+
+    def _detect_semantic_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Runs the semantic detector over a micro-batch of prompts."""
+        return self.semantic_detector.detect_batch(texts)
+
+    def _classify_batch(self, items: List[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        """Runs the attack classifier over a micro-batch of (prompt, embedding) pairs."""
+        texts, embeddings = zip(*items)
+        return self.classifier.classify_batch(list(texts), list(embeddings))
+
+    async def scan_text(self, text: str, session_id: str) -> Dict[str, Any]:
         """
         Performs a full analysis of a text prompt through all security layers.
+        Independent detectors and the classifier run concurrently in worker
+        threads, so the scan takes roughly as long as the slowest of them. The
+        classification of a semantically equivalent earlier prompt is reused
+        when cached.
 
         Args:
             text: The user-provided prompt to analyze.
@@ -47,17 +93,49 @@ class ScannerService:
             A dictionary containing the full, detailed analysis report.
         """
         if self.detectors is None:
-            self._initialize_detectors()
+            await asyncio.to_thread(self._initialize_detectors)
+
+        # The semantic detector runs first, as its embedding keys the response cache
+        semantic_result = await self._semantic_batcher.submit(text)
+        input_embedding = semantic_result.get("_emb")
+
+        # The cache only stands in for the AI path of the classifier. Prompts that
+        # hit a regex override never use it, and the other detectors always run.
+        # The embedding only covers the encoder's first max_seq_length tokens, so
+        # longer prompts could collide with a different ending and are not cached.
+        cacheable = (
+            input_embedding is not None
+            and semantic_result["token_count"] < self.semantic_detector.model.max_seq_length
+            and self.classifier._get_regex_match(text) is None
+        )
+        attack_info = self.response_cache.lookup(input_embedding) if cacheable else None
+
+        # The PII regex scan takes microseconds, so it is not worth a thread hop
+        pii_result = self.pii_detector.detect(text)
+        detector_calls = [
+            asyncio.to_thread(d.detect, text)
+            for d in self.detectors
+            if d is not self.semantic_detector and d is not self.pii_detector
+        ]
+        if attack_info is None:
+            # Run the remaining detectors and the classifier concurrently
+            *detector_results, attack_info = await asyncio.gather(
+                *detector_calls, self._classifier_batcher.submit((text, input_embedding))
+            )
+            # Only verdicts from the model are reused; a short-circuit or error is not
+            if cacheable and attack_info.get("source") == "model":
+                self.response_cache.insert(input_embedding, attack_info)
+        else:
+            detector_results = await asyncio.gather(*detector_calls)
+
+        all_results = [res for res in (pii_result, semantic_result, *detector_results) if res]
 
-        # Run all detectors and collect their raw outputs
-        all_results = [d.detect(text) for d in self.detectors if d.detect(text)]
         base_risk_score = max((res.get("score", 0.0) for res in all_results), default=0.0)
         
         # Consolidate all explicit findings from detectors
         actual_findings = [res for res in all_results if res.get("finding")]
         
-        # Get the primary classification from the advanced classifier
-        attack_info = self.classifier.classify(text)
+        # Extract the primary classification from the advanced classifier
         attack_type = attack_info.get("primary", "Unknown")
 
         # If a specific attack is identified, create a detailed finding for it
@@ -96,7 +174,7 @@ class ScannerService:
             status = "CLEAN"
 
         # Assemble the final, rich response object
-        return {
+        result = {
             "prompt_analyzed": text,
             "status": status,
             "prompt_risk": round(final_prompt_risk, 2),
@@ -111,5 +189,7 @@ class ScannerService:
             },
         }
 
+        return result
+
 # A single, shared instance for the entire application.
 scanner_service = ScannerService()
\ No newline at end of file
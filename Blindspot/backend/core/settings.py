@@ -0,0 +1,47 @@
+"""
+Runtime settings for the Blindspot backend.
+
+Most settings can be overridden with an environment variable of the same name
+prefixed with 'BLINDSPOT_'. BASE_DIR and CONCURRENT_MODEL_WORKERS are fixed.
+"""
+
+import os
+from pathlib import Path
+
+# The root directory of the Blindspot project
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Number of torch models that can run forward passes at the same time: the
+# semantic encoder and the attack classifier each have their own micro-batcher.
+CONCURRENT_MODEL_WORKERS = 2
+
+# Intra-op threads per torch operation, set when the application starts. The
+# default splits the cores between the concurrent model workers so they do not
+# oversubscribe the CPU.
+TORCH_NUM_THREADS = int(
+    os.getenv("BLINDSPOT_TORCH_NUM_THREADS", max(1, (os.cpu_count() or 1) // CONCURRENT_MODEL_WORKERS))
+)
+
+# Attack classifier mode: 'accurate' runs the full BART-MNLI zero-shot model,
+# while 'fast' compares sentence embeddings against the label hypotheses. The
+# fast mode's thresholds are not yet calibrated, so it is opt-in.
+CLASSIFIER_MODE = os.getenv("BLINDSPOT_CLASSIFIER_MODE", "accurate")
+
+# Compile the PyTorch models with TorchInductor (torch>=2.1). Opt-in, as Inductor
+# needs a C++ (or CUDA) toolchain; the models fall back to eager mode if
+# compilation fails. Has no effect on the ONNX Runtime models.
+TORCH_COMPILE = os.getenv("BLINDSPOT_TORCH_COMPILE", "0") == "1"
+
+# Directory for models exported or quantized at runtime.
+MODEL_CACHE_DIR = Path(os.getenv("BLINDSPOT_MODEL_CACHE_DIR", BASE_DIR / ".model_cache"))
+
+# Path to fastText's lid.176 language identification model. It is downloaded
+# here on first use if missing.
+FASTTEXT_LID_MODEL = Path(os.getenv("BLINDSPOT_FASTTEXT_LID_MODEL", MODEL_CACHE_DIR / "lid.176.bin"))
+
+# Run the transformer models as int8-quantized ONNX graphs on ONNX Runtime.
+# Requires the optional 'optimum[onnxruntime]' dependency.
+ONNX_INT8 = os.getenv("BLINDSPOT_ONNX_INT8", "0") == "1"
+
+# ONNX Runtime intra-op threads, defaulting to the number of physical cores.
+ORT_INTRA_OP_THREADS = int(os.getenv("BLINDSPOT_ORT_INTRA_OP_THREADS", max(1, (os.cpu_count() or 2) // 2)))
@@ -2,18 +2,23 @@
 Main application file for the Blindspot AI Security Sandbox.
 
 This file initializes the FastAPI application, mounts the static frontend files,
-and includes all the necessary API routers.
+includes all the necessary API routers, and warms up the AI models at startup.
 """
 
+import asyncio
 from pathlib import Path
 
+import torch
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from backend.api import routes_dashboard, routes_scan
+from backend.core import settings
+from backend.core.services.scanner_service import scanner_service
 
 # Initialize the main FastAPI application instance
-app = FastAPI(title="Blindspot AI Security Sandbox")
+app = FastAPI(title="Blindspot AI Security Sandbox", default_response_class=ORJSONResponse)
 
 # Define the base directory of the project
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -26,6 +31,20 @@ app.include_router(routes_dashboard.router, tags=["Dashboard"])
 app.include_router(routes_scan.router, prefix="/api", tags=["Scanner"])
 
 
+@app.on_event("startup")
+async def warmup():
+    """
+    Loads the heavy AI detectors before the first request arrives. A failure
+    is logged rather than raised, so the dashboard stays up and the first scan
+    request retries the load.
+    """
+    torch.set_num_threads(settings.TORCH_NUM_THREADS)
+    try:
+        await asyncio.to_thread(scanner_service._initialize_detectors)
+    except Exception as e:
+        print(f"Detector warm-up failed: {e}")
+
+
 @app.get("/health")
 def health_check():
     """A simple health check endpoint to confirm the server is running."""
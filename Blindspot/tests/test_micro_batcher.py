@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+
+from backend.core.services.micro_batcher import MicroBatcher
+
+
+def double_all(items):
+    return [item * 2 for item in items]
+
+
+class MicroBatcherTests(unittest.TestCase):
+    """Exercises the batcher with plain functions, so no models are needed."""
+
+    def test_single_item_is_processed(self):
+        batcher = MicroBatcher(double_all)
+        self.assertEqual(asyncio.run(batcher.submit(3)), 6)
+
+    def test_concurrent_items_share_batches_and_keep_order(self):
+        batch_sizes = []
+
+        def record(items):
+            batch_sizes.append(len(items))
+            return double_all(items)
+
+        batcher = MicroBatcher(record, max_batch_size=8)
+
+        async def submit_all():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+
+        self.assertEqual(asyncio.run(submit_all()), [i * 2 for i in range(20)])
+        self.assertLess(len(batch_sizes), 20)
+        self.assertLessEqual(max(batch_sizes), 8)
+
+    def test_reuse_across_event_loops(self):
+        batcher = MicroBatcher(double_all)
+        self.assertEqual(asyncio.run(batcher.submit(1)), 2)
+        self.assertEqual(asyncio.run(asyncio.wait_for(batcher.submit(2), timeout=1)), 4)
+
+    def test_errors_reach_every_caller(self):
+        def fail(items):
+            raise ValueError("model failed")
+
+        batcher = MicroBatcher(fail)
+
+        async def submit_all():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+        results = asyncio.run(submit_all())
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    def test_short_result_list_fails_instead_of_hanging(self):
+        batcher = MicroBatcher(lambda items: items[:-1])
+
+        async def submit_all():
+            return await asyncio.wait_for(
+                asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True), timeout=1
+            )
+
+        results = asyncio.run(submit_all())
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import re as stdlib_re
+import unittest
+from unittest import mock
+
+from backend.core.detectors import pii_detector
+from backend.core.detectors.pii_detector import PIIDetector
+
+
+class PIIDetectorTests(unittest.TestCase):
+    """Runs the detector on every available engine: hyperscan, RE2 and stdlib re."""
+
+    def engines(self):
+        """Yields each available engine's name with a detector built on it."""
+        if pii_detector.hyperscan is not None:
+            yield "hyperscan", PIIDetector()
+        with mock.patch.object(pii_detector, "hyperscan", None):
+            if pii_detector.re.__name__ == "re2":
+                yield "re2", PIIDetector()
+            with mock.patch.object(pii_detector, "re", stdlib_re):
+                yield "stdlib re", PIIDetector()
+
+    def assertPII(self, text, expected):
+        for engine, detector in self.engines():
+            with self.subTest(engine=engine, text=text):
+                result = detector.detect(text)
+                if expected:
+                    self.assertEqual(result["details"], f"Detected PII types: {', '.join(expected)}")
+                else:
+                    self.assertEqual(result, {})
+
+    def test_single_types(self):
+        self.assertPII("mail me at jane@corp.com", ["EMAIL"])
+        self.assertPII("call 555-123-4567 tomorrow", ["PHONE_NUMBER"])
+        self.assertPII("Send the report to my manager", [])
+
+    def test_overlapping_matches_report_every_type(self):
+        self.assertPII("5551234567@gmail.com", ["EMAIL", "PHONE_NUMBER"])
+
+    def test_types_are_reported_in_pattern_order(self):
+        self.assertPII("call (555) 123-4567 or write to jane@corp.com", ["EMAIL", "PHONE_NUMBER"])
+
+
+if __name__ == "__main__":
+    unittest.main()